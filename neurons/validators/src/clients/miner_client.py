@@ -51,6 +51,7 @@ class MinerClient(abc.ABC):
         self.miner_name = f"{miner_hotkey}({miner_address}:{miner_port})"
         self.ws: websockets.WebSocketClientProtocol | None = None
         self.read_messages_task: asyncio.Task | None = None
+        self.reconnect_task: asyncio.Task | None = None
         self.deferred_send_tasks: list[asyncio.Task] = []
 
         self.miner_hotkey = miner_hotkey
@@ -94,12 +95,18 @@ class MinerClient(abc.ABC):
         await self.await_connect()
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self):
         for t in self.deferred_send_tasks:
             t.cancel()
 
         if self.read_messages_task is not None and not self.read_messages_task.done():
             self.read_messages_task.cancel()
 
+        if self.reconnect_task is not None and not self.reconnect_task.done():
+            self.reconnect_task.cancel()
+
         if self.ws is not None and not self.ws.closed:
             try:
                 await self.ws.close()
@@ -138,7 +145,8 @@ class MinerClient(abc.ABC):
                 if self.debounce_counter:
                     sleep_time = self.sleep_time()
                     logger.info(
-                        f"Retrying connection to miner in {sleep_time:0.2f}",
+                        "Retrying connection to miner in %0.2f",
+                        sleep_time,
                         extra=get_extra_info(self.logging_extra),
                     )
                     await asyncio.sleep(sleep_time)
@@ -146,14 +154,16 @@ class MinerClient(abc.ABC):
                 self.read_messages_task = self.loop.create_task(self.read_messages())
                 if self.debounce_counter:
                     logger.info(
-                        f"Connected to miner after {self.debounce_counter + 1} attempts",
+                        "Connected to miner after %d attempts",
+                        self.debounce_counter + 1,
                         extra=get_extra_info(self.logging_extra),
                     )
                 return
             except (websockets.WebSocketException, OSError) as ex:
                 self.debounce_counter += 1
                 logger.error(
-                    f"Could not connect to miner: {str(ex)}",
+                    "Could not connect to miner: %s",
+                    ex,
                     extra=get_extra_info(
                         {**self.logging_extra, "debounce_counter": self.debounce_counter}
                     ),
@@ -202,7 +212,7 @@ class MinerClient(abc.ABC):
                         }
                     ),
                 )
-                self.loop.create_task(self.await_connect())
+                self.reconnect_task = self.loop.create_task(self.await_connect())
                 return
 
             try:
@@ -234,7 +244,8 @@ class MinerClient(abc.ABC):
             else:
                 if self.debounce_counter:
                     logger.info(
-                        f"Receviced valid message from miner after {self.debounce_counter + 1} connection attempts",
+                        "Receviced valid message from miner after %d connection attempts",
+                        self.debounce_counter + 1,
                         extra=get_extra_info(self.logging_extra),
                     )
                     self.debounce_counter = 0
@@ -4,7 +4,11 @@ import logging
 from clients.compute_client import ComputeClient
 
 from core.config import settings
-from core.utils import configure_logs_of_other_modules, wait_for_services_sync
+from core.utils import (
+    configure_default_executor,
+    configure_logs_of_other_modules,
+    wait_for_services_sync,
+)
 from services.ioc import ioc
 
 logger = logging.getLogger(__name__)
@@ -20,13 +24,17 @@ async def run_forever():
     compute_app_client = ComputeClient(
         keypair, f"{settings.COMPUTE_APP_URI}/validator/{keypair.ss58_address}", ioc["MinerService"]
     )
-    async with compute_app_client:
-        await compute_app_client.run_forever()
+    try:
+        async with compute_app_client:
+            await compute_app_client.run_forever()
+    finally:
+        await ioc["MinerService"].close()
 
 
 def start_process():
     loop = asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
+    configure_default_executor(loop)
     loop.run_until_complete(run_forever())
 
 
@@ -32,6 +32,11 @@ class Settings(BaseSettings):
     REDIS_PORT: int = Field(env="REDIS_PORT", default=6379)
     COMPUTE_APP_URI: str = "wss://celiumcompute.ai"
 
+    # max workers of the default executor used by asyncio.to_thread
+    THREAD_POOL_SIZE: int = Field(env="THREAD_POOL_SIZE", default=64)
+    # seconds a container operation on an executor may take, image pulls included
+    DOCKER_OP_TIMEOUT: int = Field(env="DOCKER_OP_TIMEOUT", default=30 * 60)
+
     ENV: str = Field(env="ENV", default="dev")
 
     def get_bittensor_wallet(self) -> bittensor.wallet:
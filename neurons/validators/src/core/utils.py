@@ -2,6 +2,7 @@ import asyncio
 import contextvars
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 from core.config import settings
 
@@ -57,6 +58,11 @@ def wait_for_services_sync(timeout=30):
             time.sleep(1)
 
 
+def configure_default_executor(loop: asyncio.AbstractEventLoop):
+    """Replace the loop's default executor with one sized by THREAD_POOL_SIZE."""
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=settings.THREAD_POOL_SIZE))
+
+
 def get_extra_info(extra: dict) -> dict:
     task = asyncio.current_task()
     coro_name = task.get_coro().__name__ if task else "NoTask"
@@ -125,7 +131,8 @@ class StructuredMessage:
         self.extra = extra
 
     def __str__(self):
-        return "%s >>> %s" % (self.message, json.dumps(self.extra))  # noqa
+        # values json can't encode, e.g. request models, are only stringified when emitted
+        return "%s >>> %s" % (self.message, json.dumps(self.extra, default=str))  # noqa
 
 
 _m = StructuredMessage
@@ -407,3 +407,5 @@ class Validator:
             bittensor.logging.error(f"Failed to save miner_scores: {str(e)}")
 
         self.should_exit = True
+
+        await self.miner_service.close()
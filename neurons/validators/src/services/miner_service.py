@@ -1,19 +1,26 @@
 import asyncio
+import contextlib
+import functools
 import logging
-from typing import Annotated
+from collections.abc import AsyncIterator, Awaitable, Callable, Coroutine
+from typing import Annotated, TypeVar
 
+import async_timeout
 import bittensor
 from clients.miner_client import MinerClient
 from datura.requests.miner_requests import (
     AcceptSSHKeyRequest,
+    BaseMinerRequest,
     DeclineJobRequest,
     ExecutorSSHInfo,
     FailedRequest,
+    UnAuthorizedRequest,
 )
 from datura.requests.validator_requests import SSHPubKeyRemoveRequest, SSHPubKeySubmitRequest
 from fastapi import Depends
 from payload_models.payloads import (
     ContainerBaseRequest,
+    ContainerBaseResponse,
     ContainerCreated,
     ContainerCreateRequest,
     ContainerDeleted,
@@ -38,9 +45,38 @@ logger = logging.getLogger(__name__)
 
 
 JOB_LENGTH = 300
+CONTAINER_SSH_ACCEPT_TIMEOUT = 1
+SSH_KEY_POOL_SIZE = 16
+
+T = TypeVar("T")
 
 
 class MinerService:
+    # miner websocket routes, each followed by the validator hotkey
+    _JOBS_PATH = "/jobs/"
+    _RESOURCES_PATH = "/resources/"
+
+    # miner replies to the SSH key submission, dispatched on type(msg); subclasses such as
+    # UnAuthorizedRequest(FailedRequest) need their own entry
+    _JOB_HANDLERS = {
+        AcceptSSHKeyRequest: "_on_job_accepted",
+        FailedRequest: "_on_job_failed",
+        UnAuthorizedRequest: "_on_job_failed",
+        DeclineJobRequest: "_on_job_declined",
+    }
+    _CONTAINER_HANDLERS = {
+        AcceptSSHKeyRequest: "_on_container_accepted",
+        FailedRequest: "_on_container_failed",
+        UnAuthorizedRequest: "_on_container_failed",
+    }
+    # container operations, dispatched on type(payload)
+    _CONTAINER_OPERATIONS = {
+        ContainerCreateRequest: "_create_container",
+        ContainerStartRequest: "_start_container",
+        ContainerStopRequest: "_stop_container",
+        ContainerDeleteRequest: "_delete_container",
+    }
+
     def __init__(
         self,
         ssh_service: Annotated[SSHService, Depends(SSHService)],
@@ -53,130 +89,205 @@ class MinerService:
         self.docker_service = docker_service
         self.redis_service = redis_service
 
-    async def request_job_to_miner(self, payload: MinerJobRequestPayload):
-        loop = asyncio.get_event_loop()
-        my_key: bittensor.Keypair = settings.get_bittensor_wallet().get_hotkey()
-        default_extra = {
-            "job_batch_id": payload.job_batch_id,
-            "miner_hotkey": payload.miner_hotkey,
-            "miner_address": payload.miner_address,
-            "miner_port": payload.miner_port,
+        # loaded once, every miner request signs with the same hotkey
+        self._hotkey: bittensor.Keypair = settings.get_bittensor_wallet().get_hotkey()
+        self._ss58: str = self._hotkey.ss58_address
+        self._url_suffixes: dict[str, str] = {
+            path: path + self._ss58 for path in (self._JOBS_PATH, self._RESOURCES_PATH)
         }
 
+        # pre-generated (private key, public key) pairs, refilled in the background
+        self._ssh_key_pool: asyncio.Queue[tuple[str, bytes]] = asyncio.Queue(
+            maxsize=SSH_KEY_POOL_SIZE
+        )
+        self._refill_ssh_keys_task: asyncio.Task | None = None
+
+        # SSH key removals still being sent, with the connection they are sent over
+        self._pending_key_removals: dict[asyncio.Task, MinerClient] = {}
+        # set by close(), the SSH key pool isn't refilled afterwards
+        self._closed = False
+
+    def _generate_ssh_key(self) -> tuple[str, bytes]:
+        return self.ssh_service.generate_ssh_key(self._ss58)
+
+    async def _refill_ssh_keys(self):
+        """Generate SSH keys in the default executor until the pool is full."""
+        while not self._ssh_key_pool.full():
+            keys = await asyncio.to_thread(self._generate_ssh_key)
+            self._ssh_key_pool.put_nowait(keys)
+
+    async def _get_ssh_key(self) -> tuple[str, bytes]:
+        """Take a pre-generated SSH key pair, generating one in a thread if the pool is empty."""
         try:
-            logger.info(_m("Requesting job to miner", extra=get_extra_info(default_extra)))
-            miner_client = MinerClient(
-                loop=loop,
-                miner_address=payload.miner_address,
-                miner_port=payload.miner_port,
-                miner_hotkey=payload.miner_hotkey,
-                my_hotkey=my_key.ss58_address,
-                keypair=my_key,
-                miner_url=f"ws://{payload.miner_address}:{payload.miner_port}/jobs/{my_key.ss58_address}",
+            keys = self._ssh_key_pool.get_nowait()
+        except asyncio.QueueEmpty:
+            keys = await asyncio.to_thread(self._generate_ssh_key)
+
+        if not self._closed and (
+            self._refill_ssh_keys_task is None or self._refill_ssh_keys_task.done()
+        ):
+            self._refill_ssh_keys_task = asyncio.create_task(self._refill_ssh_keys())
+
+        return keys
+
+    @contextlib.asynccontextmanager
+    async def _miner_client(
+        self, payload: MinerJobRequestPayload | ContainerBaseRequest, path: str
+    ) -> AsyncIterator[MinerClient]:
+        """Open a connection to the miner's `path` route for the duration of the block.
+
+        Concurrent requests to the same miner and route each get their own connection. It is
+        closed on exit, or by _remove_ssh_key once an SSH key removal sent over it went out.
+        """
+        miner_client = MinerClient(
+            loop=asyncio.get_running_loop(),
+            miner_address=payload.miner_address,
+            miner_port=payload.miner_port,
+            miner_hotkey=payload.miner_hotkey,
+            my_hotkey=self._ss58,
+            keypair=self._hotkey,
+            miner_url=f"ws://{payload.miner_address}:{payload.miner_port}{self._url_suffixes[path]}",
+        )
+        await miner_client.await_connect()
+        try:
+            yield miner_client
+        finally:
+            if miner_client not in self._pending_key_removals.values():
+                await miner_client.close()
+
+    def _remove_ssh_key_later(self, miner_client: MinerClient, model: SSHPubKeyRemoveRequest):
+        """Send the SSH key removal without making the caller wait for it, then close the
+        connection."""
+        task = asyncio.create_task(self._remove_ssh_key(miner_client, model))
+        self._pending_key_removals[task] = miner_client
+        task.add_done_callback(self._pending_key_removals.pop)
+
+    async def _remove_ssh_key(self, miner_client: MinerClient, model: SSHPubKeyRemoveRequest):
+        try:
+            await miner_client.send_model(model)
+        except Exception as e:
+            logger.error(
+                _m(
+                    "Error: sending SSH key removal to miner failed",
+                    extra=get_extra_info(
+                        {
+                            **miner_client.logging_extra,
+                            "executor_id": model.executor_id,
+                            "error": str(e),
+                        }
+                    ),
+                ),
             )
+        finally:
+            await miner_client.close()
 
-            async with miner_client:
-                # generate ssh key and send it to miner
-                private_key, public_key = self.ssh_service.generate_ssh_key(my_key.ss58_address)
+    async def close(self):
+        """Stop refilling the SSH key pool and wait for pending SSH key removals."""
+        self._closed = True
 
-                await miner_client.send_model(SSHPubKeySubmitRequest(public_key=public_key))
+        if self._refill_ssh_keys_task is not None:
+            self._refill_ssh_keys_task.cancel()
 
-                try:
-                    msg = await asyncio.wait_for(
-                        miner_client.job_state.miner_accepted_ssh_key_or_failed_future, JOB_LENGTH
-                    )
-                except TimeoutError:
-                    logger.error(
-                        _m(
-                            "Waiting accepted ssh key or failed request from miner resulted in TimeoutError",
-                            extra=get_extra_info(default_extra),
-                        ),
-                    )
-                    msg = None
-                except Exception:
-                    logger.error(
-                        _m(
-                            "Waiting accepted ssh key or failed request from miner resulted in an exception",
-                            extra=get_extra_info(default_extra),
-                        ),
-                    )
-                    msg = None
+        if self._pending_key_removals:
+            await asyncio.wait(list(self._pending_key_removals))
 
+    @contextlib.asynccontextmanager
+    async def _ssh_key_registration(
+        self,
+        payload: MinerJobRequestPayload | ContainerBaseRequest,
+        path: str,
+        default_extra: dict,
+        executor_id: str | None = None,
+        accept_timeout: float = JOB_LENGTH,
+    ) -> AsyncIterator[tuple[BaseMinerRequest | None, str]]:
+        """Register a fresh SSH key with the miner for the duration of the block.
+
+        Args:
+            payload: request carrying the miner address, port and hotkey.
+            path (str): miner websocket route, _JOBS_PATH or _RESOURCES_PATH.
+            default_extra (dict): logging extra of the caller.
+            executor_id (str | None): executor the SSH key is requested for.
+            accept_timeout (float): seconds to wait for the miner to accept the SSH key.
+
+        Yields:
+            (msg, private_key): the miner's reply, None if it did not answer in time, and the
+            private key. Once the miner accepted the key, its removal is always requested on
+            exit, in the background so the caller gets its result right away.
+        """
+        async with self._miner_client(payload, path) as miner_client:
+            # generate ssh key and send it to miner
+            private_key, public_key = await self._get_ssh_key()
+            await miner_client.send_model(
+                SSHPubKeySubmitRequest(public_key=public_key, executor_id=executor_id)
+            )
+
+            logger.info(
+                _m("Sent SSH key to miner.", extra=get_extra_info(default_extra)),
+            )
+
+            try:
+                async with async_timeout.timeout(accept_timeout):
+                    msg = await miner_client.job_state.miner_accepted_ssh_key_or_failed_future
+            except TimeoutError:
+                logger.error(
+                    _m(
+                        "Waiting accepted ssh key or failed request from miner resulted in TimeoutError",
+                        extra=get_extra_info(default_extra),
+                    ),
+                )
+                msg = None
+            except Exception:
+                logger.error(
+                    _m(
+                        "Waiting accepted ssh key or failed request from miner resulted in an exception",
+                        extra=get_extra_info(default_extra),
+                    ),
+                )
+                msg = None
+
+            try:
+                yield msg, private_key
+            finally:
                 if isinstance(msg, AcceptSSHKeyRequest):
-                    logger.info(
-                        _m(
-                            "Received AcceptSSHKeyRequest for miner. Running tasks for executors",
-                            extra=get_extra_info(
-                                {**default_extra, "executors": len(msg.executors)}
-                            ),
-                        ),
+                    self._remove_ssh_key_later(
+                        miner_client,
+                        SSHPubKeyRemoveRequest(public_key=public_key, executor_id=executor_id),
                     )
 
-                    tasks = [
-                        asyncio.create_task(
-                            self.task_service.create_task(
-                                miner_info=payload,
-                                executor_info=executor_info,
-                                keypair=my_key,
-                                private_key=private_key.decode("utf-8"),
-                            )
-                        )
-                        for executor_info in msg.executors
-                    ]
-
-                    results = [
-                        result
-                        for result in await asyncio.gather(*tasks, return_exceptions=True)
-                        if result
-                    ]
-                    logger.info(
-                        _m(
-                            "Finished running tasks for executors",
-                            extra=get_extra_info({**default_extra, "executors": len(results)}),
-                        ),
-                    )
-                    await self.publish_machine_specs(results, miner_client.miner_hotkey)
-                    await miner_client.send_model(SSHPubKeyRemoveRequest(public_key=public_key))
-
-                    total_score = 0
-                    for _, _, score, _, _, _ in results:
-                        total_score += score
-
-                    logger.info(
-                        _m(
-                            f"total score: {total_score}",
-                            extra=get_extra_info(default_extra),
-                        )
-                    )
+    async def _ssh_session(
+        self,
+        payload: MinerJobRequestPayload | ContainerBaseRequest,
+        path: str,
+        handler: Callable[[BaseMinerRequest | None, str, bittensor.Keypair], Awaitable[T]],
+        default_extra: dict,
+        executor_id: str | None = None,
+        accept_timeout: float = JOB_LENGTH,
+    ) -> T:
+        """Register a fresh SSH key with the miner and pass the miner's reply to `handler`.
+
+        `handler` is called with (msg, private_key, my_key), see _ssh_key_registration.
+        """
+        async with self._ssh_key_registration(
+            payload, path, default_extra, executor_id, accept_timeout
+        ) as (msg, private_key):
+            return await handler(msg, private_key, self._hotkey)
 
-                    return {
-                        "miner_hotkey": payload.miner_hotkey,
-                        "score": total_score,
-                    }
-                elif isinstance(msg, FailedRequest):
-                    logger.warning(
-                        _m(
-                            "Requesting job failed for miner",
-                            extra=get_extra_info({**default_extra, "msg": str(msg)}),
-                        ),
-                    )
-                    return None
-                elif isinstance(msg, DeclineJobRequest):
-                    logger.warning(
-                        _m(
-                            "Requesting job declined for miner",
-                            extra=get_extra_info({**default_extra, "msg": str(msg)}),
-                        ),
-                    )
-                    return None
-                else:
-                    logger.error(
-                        _m(
-                            "Unexpected msg",
-                            extra=get_extra_info({**default_extra, "msg": str(msg)}),
-                        ),
-                    )
-                    return None
+    async def request_job_to_miner(self, payload: MinerJobRequestPayload):
+        default_extra = {
+            "job_batch_id": payload.job_batch_id,
+            "miner_hotkey": payload.miner_hotkey,
+            "miner_address": payload.miner_address,
+            "miner_port": payload.miner_port,
+        }
+
+        try:
+            logger.info(_m("Requesting job to miner", extra=get_extra_info(default_extra)))
+            return await self._ssh_session(
+                payload,
+                self._JOBS_PATH,
+                functools.partial(self._run_job, payload, default_extra),
+                default_extra,
+            )
         except asyncio.CancelledError:
             logger.error(
                 _m("Requesting job to miner was cancelled", extra=get_extra_info(default_extra)),
@@ -192,6 +303,131 @@ class MinerService:
             )
             return None
 
+    async def _run_job(
+        self,
+        payload: MinerJobRequestPayload,
+        default_extra: dict,
+        msg: BaseMinerRequest | None,
+        private_key: str,
+        my_key: bittensor.Keypair,
+    ):
+        handler_name = self._JOB_HANDLERS.get(type(msg))
+        if handler_name is None:
+            logger.error(
+                _m(
+                    "Unexpected msg",
+                    extra=get_extra_info({**default_extra, "msg": msg}),
+                ),
+            )
+            return None
+
+        return await getattr(self, handler_name)(payload, default_extra, msg, private_key, my_key)
+
+    async def _on_job_accepted(
+        self,
+        payload: MinerJobRequestPayload,
+        default_extra: dict,
+        msg: AcceptSSHKeyRequest,
+        private_key: str,
+        my_key: bittensor.Keypair,
+    ):
+        logger.info(
+            _m(
+                "Received AcceptSSHKeyRequest for miner. Running tasks for executors",
+                extra=get_extra_info({**default_extra, "executors": len(msg.executors)}),
+            ),
+        )
+
+        tasks = [
+            asyncio.create_task(
+                self.task_service.create_task(
+                    miner_info=payload,
+                    executor_info=executor_info,
+                    keypair=my_key,
+                    private_key=private_key,
+                )
+            )
+            for executor_info in msg.executors
+        ]
+
+        results = [
+            result for result in await asyncio.gather(*tasks, return_exceptions=True) if result
+        ]
+        logger.info(
+            _m(
+                "Finished running tasks for executors",
+                extra=get_extra_info({**default_extra, "executors": len(results)}),
+            ),
+        )
+        await self.publish_machine_specs(results, payload.miner_hotkey)
+
+        total_score = 0
+        for _, _, score, _, _, _ in results:
+            total_score += score
+
+        logger.info(
+            _m(
+                "total score",
+                extra=get_extra_info({**default_extra, "total_score": total_score}),
+            )
+        )
+
+        return {
+            "miner_hotkey": payload.miner_hotkey,
+            "score": total_score,
+        }
+
+    async def _on_job_failed(
+        self,
+        payload: MinerJobRequestPayload,
+        default_extra: dict,
+        msg: FailedRequest,
+        private_key: str,
+        my_key: bittensor.Keypair,
+    ):
+        logger.warning(
+            _m(
+                "Requesting job failed for miner",
+                extra=get_extra_info({**default_extra, "msg": msg}),
+            ),
+        )
+        return None
+
+    async def _on_job_declined(
+        self,
+        payload: MinerJobRequestPayload,
+        default_extra: dict,
+        msg: DeclineJobRequest,
+        private_key: str,
+        my_key: bittensor.Keypair,
+    ):
+        logger.warning(
+            _m(
+                "Requesting job declined for miner",
+                extra=get_extra_info({**default_extra, "msg": msg}),
+            ),
+        )
+        return None
+
+    async def request_jobs(
+        self, payloads: list[MinerJobRequestPayload]
+    ) -> AsyncIterator[dict | None]:
+        """Request jobs to several miners concurrently, yielding results as they complete."""
+        async for result in self._as_completed(
+            [self.request_job_to_miner(payload) for payload in payloads]
+        ):
+            yield result
+
+    async def _as_completed(self, coros: list[Coroutine[None, None, T]]) -> AsyncIterator[T]:
+        tasks = [asyncio.create_task(coro) for coro in coros]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # the consumer stopped iterating early
+            for task in tasks:
+                task.cancel()
+
     async def publish_machine_specs(
         self, results: list[tuple[dict, ExecutorSSHInfo]], miner_hotkey: str
     ):
@@ -225,15 +461,13 @@ class MinerService:
             except Exception as e:
                 logger.error(
                     _m(
-                        f"Error publishing machine specs of {miner_hotkey} to compute app connector process",
+                        "Error publishing machine specs to compute app connector process",
                         extra=get_extra_info({**default_extra, "error": str(e)}),
                     ),
                     exc_info=True,
                 )
 
     async def handle_container(self, payload: ContainerBaseRequest):
-        loop = asyncio.get_event_loop()
-        my_key: bittensor.Keypair = settings.get_bittensor_wallet().get_hotkey()
         default_extra = {
             "miner_hotkey": payload.miner_hotkey,
             "executor_id": payload.executor_id,
@@ -242,263 +476,430 @@ class MinerService:
             "container_request_type": str(payload.message_type),
         }
 
-        miner_client = MinerClient(
-            loop=loop,
-            miner_address=payload.miner_address,
-            miner_port=payload.miner_port,
-            miner_hotkey=payload.miner_hotkey,
-            my_hotkey=my_key.ss58_address,
-            keypair=my_key,
-            miner_url=f"ws://{payload.miner_address}:{payload.miner_port}/resources/{my_key.ss58_address}",
+        return await self._ssh_session(
+            payload,
+            self._RESOURCES_PATH,
+            functools.partial(self._run_container_request, payload, default_extra),
+            default_extra,
+            executor_id=payload.executor_id,
+            accept_timeout=CONTAINER_SSH_ACCEPT_TIMEOUT,
         )
 
-        async with miner_client:
-            # generate ssh key and send it to miner
-            private_key, public_key = self.ssh_service.generate_ssh_key(my_key.ss58_address)
-            await miner_client.send_model(
-                SSHPubKeySubmitRequest(public_key=public_key, executor_id=payload.executor_id)
-            )
+    @contextlib.asynccontextmanager
+    async def session(self, miner: ContainerBaseRequest) -> AsyncIterator["MinerSession"]:
+        """Run several container operations on one executor with a single SSH key.
 
-            logger.info(
-                _m("Sent SSH key to miner.", extra=get_extra_info(default_extra)),
-            )
+        The connection and the SSH key registration are made once and shared by every
+        operation of the session; the key removal is requested when the block exits.
+        The session holds its connection exclusively, so handle_container or another session
+        for the same miner inside the block opens a connection of its own.
 
-            try:
-                msg = await asyncio.wait_for(
-                    miner_client.job_state.miner_accepted_ssh_key_or_failed_future, timeout=1
-                )
-            except TimeoutError:
-                logger.error(
-                    _m(
-                        "Waiting accepted ssh key or failed request from miner resulted in an timeout error",
-                        extra=get_extra_info(default_extra),
-                    ),
-                )
-                msg = None
-            except Exception:
-                logger.error(
-                    _m(
-                        "Waiting accepted ssh key or failed request from miner resulted in an exception",
-                        extra=get_extra_info(default_extra),
-                    ),
-                )
-                msg = None
+        Args:
+            miner (ContainerBaseRequest): request for the executor, carrying the miner
+                address, port, hotkey and executor id.
 
-            if isinstance(msg, AcceptSSHKeyRequest):
-                logger.info(
-                    _m(
-                        "Received AcceptSSHKeyRequest",
-                        extra=get_extra_info({**default_extra, "msg": str(msg)}),
+        Raises:
+            RuntimeError: if the miner didn't accept the SSH key for the executor.
+        """
+        default_extra = {
+            "miner_hotkey": miner.miner_hotkey,
+            "executor_id": miner.executor_id,
+            "executor_ip": miner.miner_address,
+            "executor_port": miner.miner_port,
+        }
+
+        async with self._ssh_key_registration(
+            miner,
+            self._RESOURCES_PATH,
+            default_extra,
+            executor_id=miner.executor_id,
+            accept_timeout=CONTAINER_SSH_ACCEPT_TIMEOUT,
+        ) as (msg, private_key):
+            if not isinstance(msg, AcceptSSHKeyRequest):
+                raise RuntimeError(f"Miner didn't accept SSH key: {msg}")
+
+            executor = await self._get_accepted_executor(miner, default_extra, msg)
+            if executor is None:
+                raise RuntimeError(f"Invalid executor id {miner.executor_id}")
+
+            yield MinerSession(self, default_extra, executor, private_key)
+
+    async def handle_containers(
+        self, payloads: list[ContainerBaseRequest]
+    ) -> AsyncIterator[ContainerBaseResponse]:
+        """Handle container requests concurrently, yielding responses as they complete.
+
+        A request that raises is yielded as FailedContainerRequest so it doesn't end the batch.
+        """
+        async for response in self._as_completed(
+            [self._handle_container_or_fail(payload) for payload in payloads]
+        ):
+            yield response
+
+    async def _handle_container_or_fail(
+        self, payload: ContainerBaseRequest
+    ) -> ContainerBaseResponse:
+        try:
+            return await self.handle_container(payload)
+        except Exception as e:
+            logger.error(
+                _m(
+                    "Error: container request resulted in an exception",
+                    extra=get_extra_info(
+                        {
+                            "miner_hotkey": payload.miner_hotkey,
+                            "executor_id": payload.executor_id,
+                            "error": str(e),
+                        }
                     ),
-                )
+                ),
+                exc_info=True,
+            )
+            return FailedContainerRequest(
+                miner_hotkey=payload.miner_hotkey,
+                executor_id=payload.executor_id,
+                msg=f"container request error: {str(e)}",
+            )
 
-                try:
-                    executor = msg.executors[0]
-                except Exception as e:
-                    logger.error(
-                        _m(
-                            "Error: Miner didn't return executor info",
-                            extra=get_extra_info({**default_extra, "error": str(e)}),
-                        ),
-                    )
-                    executor = None
+    async def _run_container_request(
+        self,
+        payload: ContainerBaseRequest,
+        default_extra: dict,
+        msg: BaseMinerRequest | None,
+        private_key: str,
+        my_key: bittensor.Keypair,
+    ):
+        handler_name = self._CONTAINER_HANDLERS.get(type(msg))
+        if handler_name is None:
+            logger.error(
+                _m(
+                    "Error: Unexpected msg",
+                    extra=get_extra_info({**default_extra, "msg": msg}),
+                ),
+            )
+            return FailedContainerRequest(
+                miner_hotkey=payload.miner_hotkey,
+                executor_id=payload.executor_id,
+                msg=f"Unexpected msg: {msg}",
+            )
 
-                if executor is None or executor.uuid != payload.executor_id:
-                    logger.error(
-                        _m("Error: Invalid executor id", extra=get_extra_info(default_extra)),
-                    )
-                    await miner_client.send_model(
-                        SSHPubKeyRemoveRequest(
-                            public_key=public_key, executor_id=payload.executor_id
-                        )
-                    )
+        return await getattr(self, handler_name)(payload, default_extra, msg, private_key, my_key)
 
-                    await self.redis_service.remove_rented_machine(
-                        RentedMachine(
-                            miner_hotkey=payload.miner_hotkey,
-                            executor_id=payload.executor_id,
-                            executor_ip_address=executor.address if executor else "",
-                            executor_ip_port=str(executor.port if executor else ""),
-                        )
-                    )
+    async def _on_container_failed(
+        self,
+        payload: ContainerBaseRequest,
+        default_extra: dict,
+        msg: FailedRequest,
+        private_key: str,
+        my_key: bittensor.Keypair,
+    ):
+        logger.info(
+            _m(
+                "Error: Miner failed job",
+                extra=get_extra_info({**default_extra, "msg": msg}),
+            ),
+        )
+        return FailedContainerRequest(
+            miner_hotkey=payload.miner_hotkey,
+            executor_id=payload.executor_id,
+            msg=f"create container error: {str(msg)}",
+        )
 
-                    return FailedContainerRequest(
-                        miner_hotkey=payload.miner_hotkey,
-                        executor_id=payload.executor_id,
-                        msg=f"Invalid executor id {payload.executor_id}",
-                    )
+    async def _on_container_accepted(
+        self,
+        payload: ContainerBaseRequest,
+        default_extra: dict,
+        msg: AcceptSSHKeyRequest,
+        private_key: str,
+        my_key: bittensor.Keypair,
+    ):
+        logger.info(
+            _m(
+                "Received AcceptSSHKeyRequest",
+                extra=get_extra_info({**default_extra, "msg": msg}),
+            ),
+        )
 
-                try:
-                    if isinstance(payload, ContainerCreateRequest):
-                        logger.info(
-                            _m(
-                                "Creating container",
-                                extra=get_extra_info({**default_extra, "payload": str(payload)}),
-                            ),
-                        )
-                        result = await self.docker_service.create_container(
-                            payload,
-                            executor,
-                            my_key,
-                            private_key.decode("utf-8"),
-                        )
-
-                        logger.info(
-                            _m(
-                                "Created Container",
-                                extra=get_extra_info({**default_extra, "result": str(result)}),
-                            ),
-                        )
-                        await miner_client.send_model(
-                            SSHPubKeyRemoveRequest(
-                                public_key=public_key, executor_id=payload.executor_id
-                            )
-                        )
-
-                        return ContainerCreated(
-                            miner_hotkey=payload.miner_hotkey,
-                            executor_id=payload.executor_id,
-                            container_name=result.container_name,
-                            volume_name=result.volume_name,
-                            port_maps=result.port_maps,
-                        )
-                    elif isinstance(payload, ContainerStartRequest):
-                        logger.info(
-                            _m(
-                                "Starting container",
-                                extra=get_extra_info({**default_extra, "payload": str(payload)}),
-                            ),
-                        )
-                        await self.docker_service.start_container(
-                            payload,
-                            executor,
-                            my_key,
-                            private_key.decode("utf-8"),
-                        )
-
-                        logger.info(
-                            _m(
-                                "Started Container",
-                                extra=get_extra_info({**default_extra, "payload": str(payload)}),
-                            ),
-                        )
-                        await miner_client.send_model(
-                            SSHPubKeyRemoveRequest(
-                                public_key=public_key, executor_id=payload.executor_id
-                            )
-                        )
-
-                        return ContainerStarted(
-                            miner_hotkey=payload.miner_hotkey,
-                            executor_id=payload.executor_id,
-                            container_name=payload.container_name,
-                        )
-                    elif isinstance(payload, ContainerStopRequest):
-                        await self.docker_service.stop_container(
-                            payload,
-                            executor,
-                            my_key,
-                            private_key.decode("utf-8"),
-                        )
-                        await miner_client.send_model(
-                            SSHPubKeyRemoveRequest(
-                                public_key=public_key, executor_id=payload.executor_id
-                            )
-                        )
-
-                        return ContainerStopped(
-                            miner_hotkey=payload.miner_hotkey,
-                            executor_id=payload.executor_id,
-                            container_name=payload.container_name,
-                        )
-                    elif isinstance(payload, ContainerDeleteRequest):
-                        logger.info(
-                            _m(
-                                "Deleting container",
-                                extra=get_extra_info({**default_extra, "payload": str(payload)}),
-                            ),
-                        )
-                        await self.docker_service.delete_container(
-                            payload,
-                            executor,
-                            my_key,
-                            private_key.decode("utf-8"),
-                        )
-
-                        logger.info(
-                            _m(
-                                "Deleted Container",
-                                extra=get_extra_info({**default_extra, "payload": str(payload)}),
-                            ),
-                        )
-                        await miner_client.send_model(
-                            SSHPubKeyRemoveRequest(
-                                public_key=public_key, executor_id=payload.executor_id
-                            )
-                        )
-
-                        return ContainerDeleted(
-                            miner_hotkey=payload.miner_hotkey,
-                            executor_id=payload.executor_id,
-                            container_name=payload.container_name,
-                            volume_name=payload.volume_name,
-                        )
-                    else:
-                        logger.error(
-                            _m(
-                                "Unexpected request",
-                                extra=get_extra_info({**default_extra, "payload": str(payload)}),
-                            ),
-                        )
-                        return FailedContainerRequest(
-                            miner_hotkey=payload.miner_hotkey,
-                            executor_id=payload.executor_id,
-                            msg=f"Unexpected request: {payload}",
-                        )
-
-                except Exception as e:
-                    logger.error(
-                        _m(
-                            "Error: create container error",
-                            extra=get_extra_info({**default_extra, "error": str(e)}),
-                        ),
-                    )
-                    await miner_client.send_model(
-                        SSHPubKeyRemoveRequest(
-                            public_key=public_key, executor_id=payload.executor_id
-                        )
-                    )
+        executor = await self._get_accepted_executor(payload, default_extra, msg)
+        if executor is None:
+            return FailedContainerRequest(
+                miner_hotkey=payload.miner_hotkey,
+                executor_id=payload.executor_id,
+                msg=f"Invalid executor id {payload.executor_id}",
+            )
 
-                    return FailedContainerRequest(
-                        miner_hotkey=payload.miner_hotkey,
-                        executor_id=payload.executor_id,
-                        msg=f"create container error: {str(e)}",
-                    )
+        return await self._run_container_operation(
+            payload, default_extra, executor, private_key, my_key
+        )
 
-            elif isinstance(msg, FailedRequest):
-                logger.info(
-                    _m(
-                        "Error: Miner failed job",
-                        extra=get_extra_info({**default_extra, "msg": str(msg)}),
-                    ),
-                )
-                return FailedContainerRequest(
+    async def _get_accepted_executor(
+        self, payload: ContainerBaseRequest, default_extra: dict, msg: AcceptSSHKeyRequest
+    ) -> ExecutorSSHInfo | None:
+        """Return the executor the miner accepted the SSH key for, None if it isn't the
+        requested one, in which case the machine is no longer considered rented.
+        """
+        try:
+            executor = msg.executors[0]
+        except Exception as e:
+            logger.error(
+                _m(
+                    "Error: Miner didn't return executor info",
+                    extra=get_extra_info({**default_extra, "error": str(e)}),
+                ),
+            )
+            executor = None
+
+        if executor is None or executor.uuid != payload.executor_id:
+            logger.error(
+                _m("Error: Invalid executor id", extra=get_extra_info(default_extra)),
+            )
+
+            await self.redis_service.remove_rented_machine(
+                RentedMachine(
                     miner_hotkey=payload.miner_hotkey,
                     executor_id=payload.executor_id,
-                    msg=f"create container error: {str(msg)}",
+                    executor_ip_address=executor.address if executor else "",
+                    executor_ip_port=str(executor.port if executor else ""),
+                )
+            )
+            return None
+
+        return executor
+
+    async def _run_container_operation(
+        self,
+        payload: ContainerBaseRequest,
+        default_extra: dict,
+        executor: ExecutorSSHInfo,
+        private_key: str,
+        my_key: bittensor.Keypair,
+    ) -> ContainerBaseResponse:
+        operation_name = self._CONTAINER_OPERATIONS.get(type(payload))
+        if operation_name is None:
+            logger.error(
+                _m(
+                    "Unexpected request",
+                    extra=get_extra_info({**default_extra, "payload": payload}),
+                ),
+            )
+            return FailedContainerRequest(
+                miner_hotkey=payload.miner_hotkey,
+                executor_id=payload.executor_id,
+                msg=f"Unexpected request: {payload}",
+            )
+
+        timeout = async_timeout.timeout(settings.DOCKER_OP_TIMEOUT)
+        try:
+            async with timeout:
+                return await getattr(self, operation_name)(
+                    payload, default_extra, executor, private_key, my_key
                 )
-            else:
+        except Exception as e:
+            # only our own deadline, not a TimeoutError raised by the operation (e.g. SSH connect)
+            if timeout.expired:
                 logger.error(
                     _m(
-                        "Error: Unexpected msg",
-                        extra=get_extra_info({**default_extra, "msg": str(msg)}),
+                        "Error: container operation timed out",
+                        extra=get_extra_info(
+                            {**default_extra, "timeout": settings.DOCKER_OP_TIMEOUT}
+                        ),
                     ),
                 )
+
                 return FailedContainerRequest(
                     miner_hotkey=payload.miner_hotkey,
                     executor_id=payload.executor_id,
-                    msg=f"Unexpected msg: {msg}",
+                    msg=f"container operation timed out after {settings.DOCKER_OP_TIMEOUT} seconds",
                 )
 
+            logger.error(
+                _m(
+                    "Error: create container error",
+                    extra=get_extra_info({**default_extra, "error": str(e)}),
+                ),
+            )
+
+            return FailedContainerRequest(
+                miner_hotkey=payload.miner_hotkey,
+                executor_id=payload.executor_id,
+                msg=f"create container error: {str(e)}",
+            )
+
+    async def _create_container(
+        self,
+        payload: ContainerCreateRequest,
+        default_extra: dict,
+        executor: ExecutorSSHInfo,
+        private_key: str,
+        my_key: bittensor.Keypair,
+    ) -> ContainerCreated:
+        logger.info(
+            _m(
+                "Creating container",
+                extra=get_extra_info({**default_extra, "payload": payload}),
+            ),
+        )
+        result = await self.docker_service.create_container(
+            payload,
+            executor,
+            my_key,
+            private_key,
+        )
+
+        logger.info(
+            _m(
+                "Created Container",
+                extra=get_extra_info({**default_extra, "result": result}),
+            ),
+        )
+
+        return ContainerCreated(
+            miner_hotkey=payload.miner_hotkey,
+            executor_id=payload.executor_id,
+            container_name=result.container_name,
+            volume_name=result.volume_name,
+            port_maps=result.port_maps,
+        )
+
+    async def _start_container(
+        self,
+        payload: ContainerStartRequest,
+        default_extra: dict,
+        executor: ExecutorSSHInfo,
+        private_key: str,
+        my_key: bittensor.Keypair,
+    ) -> ContainerStarted:
+        logger.info(
+            _m(
+                "Starting container",
+                extra=get_extra_info({**default_extra, "payload": payload}),
+            ),
+        )
+        await self.docker_service.start_container(
+            payload,
+            executor,
+            my_key,
+            private_key,
+        )
+
+        logger.info(
+            _m(
+                "Started Container",
+                extra=get_extra_info({**default_extra, "payload": payload}),
+            ),
+        )
+
+        return ContainerStarted(
+            miner_hotkey=payload.miner_hotkey,
+            executor_id=payload.executor_id,
+            container_name=payload.container_name,
+        )
+
+    async def _stop_container(
+        self,
+        payload: ContainerStopRequest,
+        default_extra: dict,
+        executor: ExecutorSSHInfo,
+        private_key: str,
+        my_key: bittensor.Keypair,
+    ) -> ContainerStopped:
+        await self.docker_service.stop_container(
+            payload,
+            executor,
+            my_key,
+            private_key,
+        )
+
+        return ContainerStopped(
+            miner_hotkey=payload.miner_hotkey,
+            executor_id=payload.executor_id,
+            container_name=payload.container_name,
+        )
+
+    async def _delete_container(
+        self,
+        payload: ContainerDeleteRequest,
+        default_extra: dict,
+        executor: ExecutorSSHInfo,
+        private_key: str,
+        my_key: bittensor.Keypair,
+    ) -> ContainerDeleted:
+        logger.info(
+            _m(
+                "Deleting container",
+                extra=get_extra_info({**default_extra, "payload": payload}),
+            ),
+        )
+        await self.docker_service.delete_container(
+            payload,
+            executor,
+            my_key,
+            private_key,
+        )
+
+        logger.info(
+            _m(
+                "Deleted Container",
+                extra=get_extra_info({**default_extra, "payload": payload}),
+            ),
+        )
+
+        return ContainerDeleted(
+            miner_hotkey=payload.miner_hotkey,
+            executor_id=payload.executor_id,
+            container_name=payload.container_name,
+            volume_name=payload.volume_name,
+        )
+
+
+class MinerSession:
+    """Container operations on the executor of a MinerService.session."""
+
+    def __init__(
+        self,
+        miner_service: MinerService,
+        default_extra: dict,
+        executor: ExecutorSSHInfo,
+        private_key: str,
+    ):
+        self.miner_service = miner_service
+        self.default_extra = default_extra
+        self.executor = executor
+        self.private_key = private_key
+
+    async def run(self, payload: ContainerBaseRequest) -> ContainerBaseResponse:
+        if payload.executor_id != self.executor.uuid:
+            raise ValueError(
+                f"Request for executor {payload.executor_id} in session of {self.executor.uuid}"
+            )
+
+        return await self.miner_service._run_container_operation(
+            payload,
+            {**self.default_extra, "container_request_type": str(payload.message_type)},
+            self.executor,
+            self.private_key,
+            self.miner_service._hotkey,
+        )
+
+    async def create(
+        self, payload: ContainerCreateRequest
+    ) -> ContainerCreated | FailedContainerRequest:
+        return await self.run(payload)
+
+    async def start(
+        self, payload: ContainerStartRequest
+    ) -> ContainerStarted | FailedContainerRequest:
+        return await self.run(payload)
+
+    async def stop(
+        self, payload: ContainerStopRequest
+    ) -> ContainerStopped | FailedContainerRequest:
+        return await self.run(payload)
+
+    async def delete(
+        self, payload: ContainerDeleteRequest
+    ) -> ContainerDeleted | FailedContainerRequest:
+        return await self.run(payload)
+
 
 MinerServiceDep = Annotated[MinerService, Depends(MinerService)]
@@ -18,14 +18,14 @@ class SSHService:
         key_bytes = self._hash(key.encode("utf-8"))
         return Fernet(key_bytes).decrypt(encrypted_payload.encode("utf-8")).decode("utf-8")
 
-    def generate_ssh_key(self, encryption_key: str) -> (bytes, bytes):
+    def generate_ssh_key(self, encryption_key: str) -> (str, bytes):
         """Generate SSH key pair.
 
         Args:
             encryption_key (str): key to encrypt the private key.
 
         Returns:
-            (bytes, bytes): return (private key bytes, public key bytes)
+            (str, bytes): return (encrypted private key, public key bytes)
         """
         # Generate a new private-public key pair
         private_key = ed25519.Ed25519PrivateKey.generate()
@@ -45,6 +45,4 @@ class SSHService:
         # extract pub key content, excluding first line and end line
         # pub_key_str = "".join(public_key_bytes.decode().split("\n")[1:-2])
 
-        return self._encrypt(encryption_key, private_key_bytes.decode("utf-8")).encode(
-            "utf-8"
-        ), public_key_bytes
+        return self._encrypt(encryption_key, private_key_bytes.decode("utf-8")), public_key_bytes
@@ -0,0 +1,14 @@
+import os
+import pathlib
+import sys
+
+# the validator modules import each other relative to src, as when run from there
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / "src"))
+
+# required by core.config.Settings, which is instantiated on import
+os.environ.setdefault("BITTENSOR_WALLET_NAME", "validator")
+os.environ.setdefault("BITTENSOR_WALLET_HOTKEY_NAME", "default")
+os.environ.setdefault("BITTENSOR_NETUID", "51")
+os.environ.setdefault("BITTENSOR_NETWORK", "test")
+os.environ.setdefault("SQLALCHEMY_DATABASE_URI", "postgresql://localhost/validator")
+os.environ.setdefault("ASYNC_SQLALCHEMY_DATABASE_URI", "postgresql+asyncpg://localhost/validator")
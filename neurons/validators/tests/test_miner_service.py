@@ -0,0 +1,348 @@
+import asyncio
+import types
+
+import bittensor
+import pytest
+from clients.miner_client import JobState
+from datura.requests.miner_requests import (
+    AcceptSSHKeyRequest,
+    DeclineJobRequest,
+    ExecutorSSHInfo,
+    FailedRequest,
+    UnAuthorizedRequest,
+)
+from datura.requests.validator_requests import SSHPubKeyRemoveRequest, SSHPubKeySubmitRequest
+from payload_models.payloads import (
+    ContainerStarted,
+    ContainerStartRequest,
+    ContainerStopped,
+    ContainerStopRequest,
+    FailedContainerRequest,
+    MinerJobRequestPayload,
+)
+
+from core.config import settings
+from services import miner_service as miner_service_module
+from services.miner_service import MinerService
+
+EXECUTOR_ID = "executor-1"
+PUBLIC_KEY = b"public key"
+
+
+class FakeMinerClient:
+    """Stands in for MinerClient, answering the SSH key submission with `miner.reply`."""
+
+    def __init__(self, miner: "FakeMiner", **kwargs):
+        self.miner = miner
+        self.miner_url = kwargs["miner_url"]
+        self.logging_extra = {"miner_hotkey": kwargs["miner_hotkey"]}
+        self.job_state = JobState()
+        self.sent = []
+        self.closed = False
+
+    async def await_connect(self):
+        pass
+
+    async def send_model(self, model):
+        self.sent.append(model)
+        if isinstance(model, SSHPubKeySubmitRequest):
+            self.job_state.miner_accepted_ssh_key_or_failed_future.set_result(self.miner.reply)
+        elif isinstance(model, SSHPubKeyRemoveRequest):
+            await self.miner.removal_sent.wait()
+
+    async def close(self):
+        self.closed = True
+
+    @property
+    def removals(self) -> list[SSHPubKeyRemoveRequest]:
+        return [model for model in self.sent if isinstance(model, SSHPubKeyRemoveRequest)]
+
+
+class FakeMiner:
+    def __init__(self):
+        self.reply = None
+        self.clients: list[FakeMinerClient] = []
+        self.removal_sent = asyncio.Event()
+        self.removal_sent.set()
+
+    def __call__(self, **kwargs) -> FakeMinerClient:
+        client = FakeMinerClient(self, **kwargs)
+        self.clients.append(client)
+        return client
+
+
+class StubSSHService:
+    def generate_ssh_key(self, ss58: str) -> tuple[str, bytes]:
+        return "private key", PUBLIC_KEY
+
+
+class StubDockerService:
+    def __init__(self):
+        self.error: Exception | None = None
+        self.delay = 0
+
+    async def start_container(self, payload, executor, my_key, private_key):
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+
+    async def stop_container(self, payload, executor, my_key, private_key):
+        pass
+
+
+class StubRedisService:
+    def __init__(self):
+        self.removed_rented_machines = []
+
+    async def remove_rented_machine(self, rented_machine):
+        self.removed_rented_machines.append(rented_machine)
+
+
+@pytest.fixture
+def miner(monkeypatch) -> FakeMiner:
+    miner = FakeMiner()
+    monkeypatch.setattr(miner_service_module, "MinerClient", miner)
+    return miner
+
+
+@pytest.fixture
+def service(monkeypatch, miner) -> MinerService:
+    hotkey = bittensor.Keypair.create_from_uri("//Alice")
+    monkeypatch.setattr(
+        type(settings),
+        "get_bittensor_wallet",
+        lambda self: types.SimpleNamespace(get_hotkey=lambda: hotkey),
+    )
+    return MinerService(
+        ssh_service=StubSSHService(),
+        task_service=None,
+        docker_service=StubDockerService(),
+        redis_service=StubRedisService(),
+    )
+
+
+def accept(executor_id: str = EXECUTOR_ID) -> AcceptSSHKeyRequest:
+    return AcceptSSHKeyRequest(
+        executors=[
+            ExecutorSSHInfo(
+                uuid=executor_id,
+                address="10.0.0.2",
+                port=8001,
+                ssh_username="root",
+                ssh_port=22,
+                python_path="/usr/bin/python3",
+                root_dir="/root",
+            )
+        ]
+    )
+
+
+def start_request(executor_id: str = EXECUTOR_ID) -> ContainerStartRequest:
+    return ContainerStartRequest(
+        miner_hotkey="miner",
+        miner_address="10.0.0.1",
+        miner_port=8000,
+        executor_id=executor_id,
+        container_name="container",
+    )
+
+
+def test_handle_container_removes_ssh_key(service, miner):
+    miner.reply = accept()
+
+    async def run():
+        response = await service.handle_container(start_request())
+        await service.close()
+        return response
+
+    assert isinstance(asyncio.run(run()), ContainerStarted)
+
+    (client,) = miner.clients
+    assert client.miner_url == f"ws://10.0.0.1:8000/resources/{service._ss58}"
+    assert client.removals == [
+        SSHPubKeyRemoveRequest(public_key=PUBLIC_KEY, executor_id=EXECUTOR_ID)
+    ]
+    assert client.closed
+
+
+def test_ssh_key_removed_when_handler_raises(service, miner):
+    miner.reply = accept()
+
+    async def handler(msg, private_key, my_key):
+        raise ValueError("handler failed")
+
+    async def run():
+        try:
+            await service._ssh_session(
+                start_request(), service._RESOURCES_PATH, handler, {}, executor_id=EXECUTOR_ID
+            )
+        finally:
+            await service.close()
+
+    with pytest.raises(ValueError, match="handler failed"):
+        asyncio.run(run())
+
+    (client,) = miner.clients
+    assert len(client.removals) == 1
+    assert client.closed
+
+
+def test_ssh_key_removed_when_session_body_raises(service, miner):
+    miner.reply = accept()
+
+    async def run():
+        try:
+            async with service.session(start_request()):
+                raise ValueError("session body failed")
+        finally:
+            await service.close()
+
+    with pytest.raises(ValueError, match="session body failed"):
+        asyncio.run(run())
+
+    (client,) = miner.clients
+    assert len(client.removals) == 1
+    assert client.closed
+
+
+def test_unauthorized_request_closes_client(service, miner):
+    miner.reply = UnAuthorizedRequest(details="no")
+
+    response = asyncio.run(service.handle_container(start_request()))
+
+    assert isinstance(response, FailedContainerRequest)
+    assert response.msg.startswith("create container error")
+    (client,) = miner.clients
+    assert client.removals == []
+    assert client.closed
+
+
+def test_declined_job_closes_client(service, miner):
+    miner.reply = DeclineJobRequest()
+
+    result = asyncio.run(
+        service.request_job_to_miner(
+            MinerJobRequestPayload(
+                job_batch_id="batch",
+                miner_hotkey="miner",
+                miner_address="10.0.0.1",
+                miner_port=8000,
+            )
+        )
+    )
+
+    assert result is None
+    (client,) = miner.clients
+    assert client.miner_url == f"ws://10.0.0.1:8000/jobs/{service._ss58}"
+    assert client.removals == []
+    assert client.closed
+
+
+def test_session_raises_when_miner_fails(service, miner):
+    miner.reply = FailedRequest(details="busy")
+
+    async def run():
+        async with service.session(start_request()):
+            pass
+
+    with pytest.raises(RuntimeError, match="didn't accept SSH key"):
+        asyncio.run(run())
+
+    (client,) = miner.clients
+    assert client.removals == []
+    assert client.closed
+
+
+def test_session_raises_for_wrong_executor(service, miner):
+    miner.reply = accept(executor_id="executor-2")
+
+    async def run():
+        try:
+            async with service.session(start_request()):
+                pass
+        finally:
+            await service.close()
+
+    with pytest.raises(RuntimeError, match=f"Invalid executor id {EXECUTOR_ID}"):
+        asyncio.run(run())
+
+    assert len(service.redis_service.removed_rented_machines) == 1
+    (client,) = miner.clients
+    # the miner registered the key, so it is still removed
+    assert len(client.removals) == 1
+    assert client.closed
+
+
+def test_session_runs_several_operations_on_one_connection(service, miner):
+    miner.reply = accept()
+
+    async def run():
+        async with service.session(start_request()) as session:
+            started = await session.start(start_request())
+            stopped = await session.stop(
+                ContainerStopRequest(
+                    miner_hotkey="miner", executor_id=EXECUTOR_ID, container_name="container"
+                )
+            )
+            with pytest.raises(ValueError):
+                await session.start(start_request(executor_id="executor-2"))
+        await service.close()
+        return started, stopped
+
+    started, stopped = asyncio.run(run())
+
+    assert isinstance(started, ContainerStarted)
+    assert isinstance(stopped, ContainerStopped)
+    (client,) = miner.clients
+    assert len(client.removals) == 1
+
+
+def test_container_operation_timeout(service, miner, monkeypatch):
+    miner.reply = accept()
+    monkeypatch.setattr(settings, "DOCKER_OP_TIMEOUT", 0.01)
+    service.docker_service.delay = 1
+
+    response = asyncio.run(service.handle_container(start_request()))
+
+    assert isinstance(response, FailedContainerRequest)
+    assert response.msg == "container operation timed out after 0.01 seconds"
+
+
+def test_container_operation_timeout_error_is_not_deadline(service, miner):
+    miner.reply = accept()
+    service.docker_service.error = TimeoutError("ssh connect timed out")
+
+    async def run():
+        async with service.session(start_request()) as session:
+            return await session.start(start_request())
+
+    response = asyncio.run(run())
+
+    assert isinstance(response, FailedContainerRequest)
+    assert response.msg == "create container error: ssh connect timed out"
+
+
+def test_close_waits_for_pending_removals_and_stops_refill(service, miner):
+    miner.reply = accept()
+    miner.removal_sent.clear()
+
+    async def run():
+        await service.handle_container(start_request())
+        (client,) = miner.clients
+        refill_task = service._refill_ssh_keys_task
+
+        close_task = asyncio.create_task(service.close())
+        await asyncio.sleep(0.01)
+        assert not close_task.done()
+        assert not client.closed
+
+        miner.removal_sent.set()
+        await close_task
+        assert client.closed
+        assert refill_task.done()
+
+        # keys are still handed out, but the pool isn't refilled anymore
+        await service._get_ssh_key()
+        assert service._refill_ssh_keys_task is refill_task
+
+    asyncio.run(run())